@@ -0,0 +1,33 @@
+"""Build-time conversion of the Keras model to the float16 TFLite model served by main.py
+
+main.py also imports convert_keras_to_tflite() for a first-boot fallback when no
+TFLite model was shipped.
+
+Run from the backend directory before deploying so startup never has to convert:
+
+    python convert_model.py
+"""
+import os
+
+def convert_keras_to_tflite(keras_path, tflite_path):
+    """Convert the saved Keras model to a float16-quantized TFLite FlatBuffer once"""
+    import tensorflow as tf
+    keras_model = tf.keras.models.load_model(keras_path, compile=False)
+    converter = tf.lite.TFLiteConverter.from_keras_model(keras_model)
+    # fp16 weights halve the model size; int8 is slower than fp32 on x86 CPUs
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_types = [tf.float16]
+    # Per-process temp file plus os.replace, so concurrent workers never load a partial model
+    tmp_path = f"{tflite_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(converter.convert())
+    os.replace(tmp_path, tflite_path)
+    return tflite_path
+
+if __name__ == "__main__":
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    output = convert_keras_to_tflite(
+        os.path.join(backend_dir, "ev_bms_colab_model.h5"),
+        os.path.join(backend_dir, "ev_bms_fp16.tflite")
+    )
+    print(f"Wrote TFLite model: {output}")
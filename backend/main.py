@@ -1,46 +1,229 @@
+import os
+
+# Optimize TensorFlow for faster loading (must be set before TF/NumPy import)
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
+# A single-sample model is dominated by thread-pool overhead, so run single-threaded
+for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS', 'TF_NUM_INTEROP_THREADS'):
+    os.environ.setdefault(var, '1')
+
 from fastapi import FastAPI, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 import warnings
-import os
-import pandas as pd
+import hashlib
+import threading
+import logging
+import orjson
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
-import tensorflow as tf
-from sklearn.preprocessing import StandardScaler, MinMaxScaler, LabelEncoder
-import uuid
-import asyncio
 
-# Optimize TensorFlow for faster loading
-os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
-os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
-tf.config.set_visible_devices([], 'GPU')  # Use CPU only for faster startup
 warnings.filterwarnings('ignore')
 
-app = FastAPI(title="EV Battery Management System")
+# uvicorn only configures its own loggers, so set up the root logger for this module.
+# Set LOG_LEVEL=WARNING in production to drop per-request messages; they use lazy
+# %-formatting, so suppressed levels cost nothing. basicConfig is a no-op if the
+# embedding process already configured logging.
+logging.basicConfig(
+    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+    format="%(levelname)s:     %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Heavy libraries are imported in load_models() so importing this module (e.g. from
+# convert_model.py or a worker spawn) stays cheap; startup still waits for them
+pd = None
+tf = None
+
+app = FastAPI(title="EV Battery Management System", default_response_class=ORJSONResponse)
 
 # Global variables to cache loaded models and data
-model = None
-scaler = None
+interpreter = None
+keras_model = None
+input_index = None
+output_index = None
+input_buffer = None
+output_buffer = None
+# The TFLite interpreter is not thread-safe and sync endpoints run in a threadpool
+interpreter_lock = threading.Lock()
 data = None
 label_encoders = {}
 numeric_features = []
+precomputed_means = {}
+scaled_inputs = {}
+feature_scale = None
+feature_inverse_scale = None
+feature_min = None
+response_cache = {}
 vehicle_type_to_model = {
     "car": "Model A",
     "bike": "Model B", 
     "scooter": "Model C",
     "bus": "Model D"
 }
+valid_vehicle_types = list(vehicle_type_to_model.keys())
+invalid_vehicle_type_detail = f"Invalid vehicle type. Valid types: {valid_vehicle_types}"
+
+# Fixed per-model seeds so the dummy fallback is reproducible without reseeding global state
+dummy_seeds = {
+    ev_model: int.from_bytes(hashlib.md5(ev_model.encode()).digest()[:8], "little")
+    for ev_model in vehicle_type_to_model.values()
+}
+
+# Explicit column types so read_csv skips type inference
+csv_dtypes = {
+    'SOC (%)': 'float64',
+    'Voltage (V)': 'float64',
+    'Current (A)': 'float64',
+    'Battery Temp (°C)': 'float64',
+    'Ambient Temp (°C)': 'float64',
+    'Charging Duration (min)': 'float64',
+    'Degradation Rate (%)': 'float64',
+    'Charging Mode': 'category',
+    'Efficiency (%)': 'float64',
+    'Battery Type': 'category',
+    'Charging Cycles': 'float64',
+    'EV Model': 'category',
+    'Optimal Charging Duration Class': 'float64'
+}
+
+def load_dataset(csv_file):
+    """Load the dataset, preferring an up-to-date parquet copy of the CSV"""
+    parquet_file = os.path.splitext(csv_file)[0] + ".parquet"
+    if os.path.exists(parquet_file) and os.path.getmtime(parquet_file) >= os.path.getmtime(csv_file):
+        try:
+            logger.info("Loading parquet data: %s", parquet_file)
+            return pd.read_parquet(parquet_file)
+        except Exception as e:
+            logger.warning("Parquet load error, falling back to CSV: %s", e)
+    
+    logger.info("Loading CSV data...")
+    df = pd.read_csv(csv_file, dtype=csv_dtypes)
+    try:
+        # Per-process temp file plus os.replace, so concurrent workers never read a partial copy
+        tmp_file = f"{parquet_file}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_file, index=False)
+        os.replace(tmp_file, parquet_file)
+        logger.info("Wrote parquet copy: %s", parquet_file)
+    except Exception as e:
+        logger.warning("Could not write parquet copy: %s", e)
+    return df
+
+def fit_min_max(frame, columns):
+    """Min-max scale columns in place and return the scale, inverse-scale and min vectors"""
+    values = frame[columns].to_numpy(dtype=np.float64)
+    data_min = values.min(axis=0)
+    data_range = values.max(axis=0) - data_min
+    data_range[data_range == 0] = 1.0  # Same zero-range handling as sklearn's MinMaxScaler
+    frame[columns] = (values - data_min) / data_range
+    return (
+        (1.0 / data_range).astype(np.float32),
+        data_range.astype(np.float32),
+        data_min.astype(np.float32)
+    )
+
+def run_interpreter(scaled_features):
+    """Run one forward pass and return a copy of the model output"""
+    with interpreter_lock:
+        if interpreter is None:
+            # Keras fallback when no TFLite model could be built or loaded
+            return keras_model(scaled_features, training=False).numpy()
+        if input_buffer is not None:
+            # Write straight into the interpreter's input tensor; the view is not held across invoke()
+            np.copyto(input_buffer(), scaled_features)
+            interpreter.invoke()
+            return output_buffer().copy()
+        interpreter.set_tensor(input_index, scaled_features.astype(np.float32, copy=False))
+        interpreter.invoke()
+        return interpreter.get_tensor(output_index)
+
+def warmup_interpreter():
+    """Run a dummy forward pass so kernels are allocated before real traffic"""
+    if interpreter is None and keras_model is None:
+        return False
+    run_interpreter(np.zeros((1, len(numeric_features), 1), dtype=np.float32))
+    return True
+
+def compute_prediction(ev_model):
+    """Return the original and predicted feature values for an EV model, and whether
+    the result is safe to cache (False when a model error forced the noise fallback)"""
+    # One draw covers both dummy rows: [0] the input in [0.1, 0.9), [1] the noise in [-0.1, 0.1)
+    noise = np.random.default_rng(dummy_seeds.get(ev_model)).random((2, len(numeric_features)))
+    
+    # Use the cached feature means for this EV model (or generate dummy data)
+    original = precomputed_means.get(ev_model)
+    if original is None:
+        # Generate dummy data
+        logger.info("Using dummy data for prediction")
+        original = noise[0] * 0.8 + 0.1
+    
+    # Make prediction
+    if (interpreter is not None or keras_model is not None) and feature_scale is not None:
+        try:
+            scaled_features = scaled_inputs.get(ev_model)
+            if scaled_features is None:
+                scaled_features = ((original - feature_min) * feature_scale).reshape(1, len(numeric_features), 1)
+            
+            prediction_scaled = run_interpreter(scaled_features)
+            prediction = prediction_scaled.ravel() * feature_inverse_scale + feature_min
+        except Exception as model_error:
+            logger.warning("Model prediction error: %s", model_error)
+            # Fallback to dummy prediction; not cached so the model is retried next request
+            return original, original + (noise[1] * 0.2 - 0.1), False
+    else:
+        # Generate dummy prediction
+        prediction = original + (noise[1] * 0.2 - 0.1)
+    
+    return original, prediction, True
+
+def build_response(vehicle_type, original, prediction):
+    """Assemble the /predict/ response for a vehicle type"""
+    ev_model = vehicle_type_to_model[vehicle_type]
+    
+    # Prepare table data
+    original_rounded = np.round(original.astype(np.float64), 4)
+    predicted_rounded = np.round(prediction.astype(np.float64), 4)
+    difference_rounded = np.round(predicted_rounded - original_rounded, 4)
+    rows = [
+        {"parameter": col, "original": orig, "predicted": pred, "difference": diff}
+        for col, orig, pred, diff in zip(
+            numeric_features,
+            original_rounded.tolist(),
+            predicted_rounded.tolist(),
+            difference_rounded.tolist()
+        )
+    ]
+    
+    return {
+        "status": "success",
+        "vehicle_type": vehicle_type,
+        "ev_model": ev_model,
+        "chart_series": {
+            "labels": numeric_features,
+            "original": original.tolist(),
+            "predicted": prediction.tolist()
+        },
+        "table_data": rows
+    }
 
 # Load models and data at startup
 @app.on_event("startup")
 async def load_models():
-    global model, scaler, data, label_encoders, numeric_features
+    global interpreter, keras_model, input_index, output_index, input_buffer, output_buffer
+    global data, label_encoders, numeric_features
+    global precomputed_means, scaled_inputs, response_cache
+    global feature_scale, feature_inverse_scale, feature_min
+    global pd, tf
     
     try:
-        print("Starting model and data loading...")
+        logger.info("Starting model and data loading...")
+        
+        import pandas as pd
+        import tensorflow as tf
+        
+        tf.config.set_visible_devices([], 'GPU')  # Use CPU only for faster startup
+        tf.config.threading.set_intra_op_parallelism_threads(1)
+        tf.config.threading.set_inter_op_parallelism_threads(1)
         
         # Define file paths - check multiple locations
         csv_paths = [
@@ -50,6 +233,13 @@ async def load_models():
             os.path.join(os.path.dirname(__file__), "..", "ev_battery_charging_data.csv")
         ]
         
+        tflite_paths = [
+            "ev_bms_fp16.tflite",
+            "../ev_bms_fp16.tflite",
+            os.path.join(os.path.dirname(__file__), "ev_bms_fp16.tflite"),
+            os.path.join(os.path.dirname(__file__), "..", "ev_bms_fp16.tflite")
+        ]
+        
         model_paths = [
             "ev_bms_colab_model.h5",
             "../ev_bms_colab_model.h5",
@@ -62,89 +252,179 @@ async def load_models():
         for path in csv_paths:
             if os.path.exists(path):
                 csv_file = path
-                print(f"Found CSV file: {path}")
+                logger.info("Found CSV file: %s", path)
                 break
         
         if csv_file is None:
-            print("Warning: CSV file not found, will use dummy data")
+            logger.warning("CSV file not found, will use dummy data")
         
-        # Find model file
+        # Find the TFLite model built by convert_model.py and the Keras model it comes from
         model_file = None
-        for path in model_paths:
+        for path in tflite_paths:
             if os.path.exists(path):
                 model_file = path
-                print(f"Found model file: {path}")
+                logger.info("Found TFLite model file: %s", path)
                 break
         
-        if model_file is None:
-            print("Warning: Model file not found, will use dummy model")
+        keras_file = None
+        for path in model_paths:
+            if os.path.exists(path):
+                keras_file = path
+                logger.info("Found Keras model file: %s", path)
+                break
+        
+        if model_file is None and keras_file is None:
+            logger.warning("Model file not found, will use dummy model")
         
         # Load data if available
         if csv_file and os.path.exists(csv_file):
-            print("Loading CSV data...")
-            data = pd.read_csv(csv_file)
+            data = load_dataset(csv_file)
             data.dropna(inplace=True)
             
             # Handle categorical columns if they exist
             categorical_columns = ['Charging Mode', 'Battery Type', 'EV Model']
             existing_categorical = [col for col in categorical_columns if col in data.columns]
             
-            if existing_categorical:
-                label_encoders = {col: LabelEncoder().fit(data[col]) for col in existing_categorical}
-                for col in existing_categorical:
-                    data[col] = label_encoders[col].transform(data[col])
+            # Keep the raw model names before they are label encoded
+            ev_model_names = data['EV Model'].copy() if 'EV Model' in data.columns else None
+            
+            # Sorted class-to-index maps match LabelEncoder's encoding without sklearn overhead
+            for col in existing_categorical:
+                mapping = {value: index for index, value in enumerate(sorted(data[col].unique()))}
+                label_encoders[col] = mapping
+                data[col] = data[col].map(mapping).astype(np.int32)
             
             # Define numeric features
             exclude_cols = existing_categorical + ['Optimal Charging Duration Class']
             numeric_features = [col for col in data.columns if col not in exclude_cols]
             
             if numeric_features:
-                scaler = MinMaxScaler()
-                data[numeric_features] = scaler.fit_transform(data[numeric_features])
-                print(f"Processed {len(numeric_features)} numeric features")
+                # Cache per-model feature means before scaling overwrites the raw values
+                if ev_model_names is not None:
+                    # observed=True: categories emptied by dropna() must not yield all-NaN rows
+                    means = data[numeric_features].groupby(ev_model_names, observed=True).mean()
+                    precomputed_means = {
+                        name: row.to_numpy(dtype=np.float32) for name, row in means.iterrows()
+                    }
+                    logger.info("Cached feature means for %s EV models", len(precomputed_means))
+                
+                # EV models absent from the dataset use the overall means rather than dummy values
+                overall_means = data[numeric_features].mean().to_numpy(dtype=np.float32)
+                for ev_model in vehicle_type_to_model.values():
+                    if ev_model not in precomputed_means:
+                        logger.warning("No rows for %s, using overall dataset means", ev_model)
+                        precomputed_means[ev_model] = overall_means
+                
+                feature_scale, feature_inverse_scale, feature_min = fit_min_max(data, numeric_features)
+                logger.info("Processed %s numeric features", len(numeric_features))
         else:
             # Create dummy data if CSV not found
-            print("Creating dummy data...")
+            logger.info("Creating dummy data...")
             numeric_features = ['SOC (%)', 'Voltage (V)', 'Current (A)', 'Battery Temp (°C)', 
                               'Ambient Temp (°C)', 'Charging Duration (min)', 
                               'Degradation Rate (%)', 'Efficiency (%)', 'Charging Cycles']
             
-            # Create dummy dataset
-            np.random.seed(42)
-            dummy_data = {}
-            for feature in numeric_features:
-                dummy_data[feature] = np.random.uniform(0, 100, 1000)
-            
-            data = pd.DataFrame(dummy_data)
-            scaler = MinMaxScaler()
-            data[numeric_features] = scaler.fit_transform(data[numeric_features])
+            # Create dummy dataset in a single vectorized draw
+            rng = np.random.default_rng(42)
+            data = pd.DataFrame(rng.uniform(0, 100, (1000, len(numeric_features))), columns=numeric_features)
+            feature_scale, feature_inverse_scale, feature_min = fit_min_max(data, numeric_features)
+        
+        if feature_scale is not None:
+            # Model-ready (1, N, 1) float32 inputs, so requests skip scaling entirely
+            scaled_inputs = {
+                name: ((means - feature_min) * feature_scale).reshape(1, len(numeric_features), 1)
+                for name, means in precomputed_means.items()
+            }
+        
+        # Convert on first boot only if the build step did not ship a TFLite model
+        if model_file is None and keras_file is not None:
+            try:
+                from convert_model import convert_keras_to_tflite
+                logger.info("Converting Keras model to TFLite: %s", keras_file)
+                model_file = convert_keras_to_tflite(
+                    keras_file, os.path.join(os.path.dirname(keras_file), "ev_bms_fp16.tflite")
+                )
+            except Exception as e:
+                logger.warning("TFLite conversion error, will use the Keras model: %s", e)
         
         # Load model if available
         if model_file and os.path.exists(model_file):
-            print("Loading TensorFlow model...")
-            model = tf.keras.models.load_model(model_file, compile=False)
-            print("Model loaded successfully!")
+            try:
+                logger.info("Loading TFLite model...")
+                interpreter = tf.lite.Interpreter(model_path=model_file, num_threads=1)
+                interpreter.allocate_tensors()
+                input_details = interpreter.get_input_details()[0]
+                output_details = interpreter.get_output_details()[0]
+                input_index = input_details['index']
+                output_index = output_details['index']
+                
+                # Zero-copy tensor views are only safe when the shapes are static,
+                # so pin a dynamic batch dimension to the single sample we send.
+                # allocate_tensors() reports -1 dims as 1 in 'shape', so only
+                # 'shape_signature' can tell whether the output stays dynamic.
+                if -1 in input_details['shape_signature']:
+                    interpreter.resize_tensor_input(input_index, [1, len(numeric_features), 1], strict=True)
+                    interpreter.allocate_tensors()
+                if (-1 not in output_details['shape_signature'][1:]
+                        and input_details['dtype'] == np.float32):
+                    input_buffer = interpreter.tensor(input_index)
+                    output_buffer = interpreter.tensor(output_index)
+                logger.info("Model loaded successfully!")
+            except Exception as e:
+                logger.warning("TFLite load error, will use the Keras model: %s", e)
+                interpreter = input_buffer = output_buffer = None
+        
+        if interpreter is None and keras_file is not None:
+            try:
+                logger.info("Loading Keras model...")
+                keras_model = tf.keras.models.load_model(keras_file, compile=False)
+                logger.info("Keras model loaded successfully!")
+            except Exception as e:
+                logger.error("Keras model load error: %s", e)
+        
+        if interpreter is not None or keras_model is not None:
+            try:
+                # Second pass flushes any one-time allocation paths
+                for _ in range(2):
+                    warmup_interpreter()
+                logger.info("Model warmed up")
+            except Exception as e:
+                logger.error("Model warmup error: %s", e)
         else:
-            print("Model file not found, predictions will use dummy data")
+            logger.warning("Model file not found, predictions will use dummy data")
         
-        print("Startup completed successfully!")
+        # Pre-serialize responses for every vehicle type before traffic arrives
+        for vehicle_type, ev_model in vehicle_type_to_model.items():
+            original, prediction, cacheable = compute_prediction(ev_model)
+            if cacheable:
+                response_cache[vehicle_type] = orjson.dumps(build_response(vehicle_type, original, prediction))
+        
+        logger.info("Startup completed successfully!")
         
     except Exception as e:
-        print(f"Startup error: {str(e)}")
+        logger.error("Startup error: %s", e)
         # Don't raise the error, just log it - the app can still run with dummy data
 
-# Add CORS middleware
+# Add CORS middleware; set CORS_ORIGINS to a comma-separated whitelist in production
+cors_origins = [origin.strip() for origin in os.environ.get("CORS_ORIGINS", "*").split(",") if origin.strip()]
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
+    allow_origins=cors_origins,
+    allow_credentials="*" not in cors_origins,
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
 )
 
 # Mount static files
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers and CDNs cache assets indefinitely"""
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
 os.makedirs("static", exist_ok=True)
-app.mount("/static", StaticFiles(directory="static"), name="static")
+app.mount("/static", CachedStaticFiles(directory="static", html=False), name="static")
 
 @app.get("/")
 async def root():
@@ -152,164 +432,82 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    global model, data, scaler
+    global interpreter, data, feature_scale
     return {
         "status": "healthy",
-        "model_loaded": model is not None,
+        "model_loaded": interpreter is not None or keras_model is not None,
         "data_loaded": data is not None,
-        "scaler_loaded": scaler is not None
+        "scaler_loaded": feature_scale is not None
     }
 
-@app.get("/image/{filename}")
-async def get_image(filename: str):
-    """Serve images from static directory"""
-    file_path = os.path.join("static", filename)
-    if os.path.exists(file_path):
-        from fastapi.responses import FileResponse
-        return FileResponse(file_path, media_type="image/png")
-    raise HTTPException(status_code=404, detail="Image not found")
-
+# Plain def: the body is CPU-bound with nothing to await, so Starlette runs it
+# in its threadpool instead of blocking the event loop
 @app.post("/predict/")
-async def predict(vehicle_type: str = Form(...)):
+def predict(vehicle_type: str = Form(...)):
     try:
-        print(f"Prediction request for vehicle type: {vehicle_type}")
+        logger.info("Prediction request for vehicle type: %s", vehicle_type)
         
         # Use global variables
-        global model, scaler, data, numeric_features
+        global response_cache
         
         # Validate vehicle type
-        if vehicle_type.lower() not in vehicle_type_to_model:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid vehicle type. Valid types: {list(vehicle_type_to_model.keys())}"
-            )
-        
-        ev_model = vehicle_type_to_model[vehicle_type.lower()]
-        
-        # Get sample data (either from real data or generate dummy data)
-        if data is not None and len(data) > 0:
-            # Use real data
-            sample_idx = np.random.randint(0, len(data))
-            original = data.iloc[sample_idx][numeric_features].values
-        else:
-            # Generate dummy data
-            print("Using dummy data for prediction")
-            original = np.random.uniform(0.1, 0.9, len(numeric_features))
-        
-        # Make prediction
-        if model is not None and scaler is not None:
-            try:
-                # Scale input
-                original_reshaped = original.reshape(1, -1)
-                scaled_features = scaler.transform(original_reshaped)
-                
-                # Reshape for model if needed
-                if len(scaled_features.shape) == 2:
-                    scaled_features = scaled_features.reshape((1, scaled_features.shape[1], 1))
-                
-                # Make prediction
-                prediction_scaled = model.predict(scaled_features, verbose=0)
-                prediction = scaler.inverse_transform(prediction_scaled.reshape(1, -1)).flatten()
-            except Exception as model_error:
-                print(f"Model prediction error: {model_error}")
-                # Fallback to dummy prediction
-                prediction = original + np.random.uniform(-0.1, 0.1, len(original))
-        else:
-            # Generate dummy prediction
-            prediction = original + np.random.uniform(-0.1, 0.1, len(original))
-        
-        # Create visualization
-        try:
-            plt.figure(figsize=(12, 6))
-            plt.style.use('default')
-            
-            index = np.arange(len(numeric_features))
-            bar_width = 0.35
-            
-            bars1 = plt.bar(index - bar_width/2, original, bar_width, 
-                           label='Original', alpha=0.8, color='#2E86AB')
-            bars2 = plt.bar(index + bar_width/2, prediction, bar_width, 
-                           label='Predicted', alpha=0.8, color='#A23B72')
-            
-            plt.xlabel('Parameters', fontsize=12)
-            plt.ylabel('Values', fontsize=12)
-            plt.title(f"{vehicle_type.title()} - Battery Parameters: Original vs Predicted", fontsize=14)
-            plt.xticks(index, numeric_features, rotation=45, ha='right')
-            plt.legend(fontsize=12)
-            plt.grid(True, alpha=0.3)
-            
-            # Add value labels on bars
-            for bar in bars1:
-                height = bar.get_height()
-                plt.text(bar.get_x() + bar.get_width()/2., height,
-                        f'{height:.2f}', ha='center', va='bottom', fontsize=8)
-            
-            for bar in bars2:
-                height = bar.get_height()
-                plt.text(bar.get_x() + bar.get_width()/2., height,
-                        f'{height:.2f}', ha='center', va='bottom', fontsize=8)
-            
-            plt.tight_layout()
-            
-            # Save plot
-            plot_filename = f"{uuid.uuid4().hex}.png"
-            plot_path = os.path.join("static", plot_filename)
-            plt.savefig(plot_path, dpi=100, bbox_inches='tight', facecolor='white')
-            plt.close()
-            
-            print(f"Plot saved to: {plot_path}")
-            chart_url = f"/static/{plot_filename}"
-            
-        except Exception as plot_error:
-            print(f"Plot generation error: {plot_error}")
-            chart_url = "/static/placeholder.png"  # Use placeholder if plot fails
+        vt = vehicle_type.lower()
+        if vt not in vehicle_type_to_model:
+            raise HTTPException(status_code=400, detail=invalid_vehicle_type_detail)
         
-        # Prepare table data
-        rows = []
-        for i, col in enumerate(numeric_features):
-            original_val = float(original[i])
-            predicted_val = float(prediction[i])
-            difference_val = predicted_val - original_val
-            
-            rows.append({
-                "parameter": col,
-                "original": round(original_val, 4),
-                "predicted": round(predicted_val, 4),
-                "difference": round(difference_val, 4)
-            })
+        # Output is deterministic per vehicle type, so serve the memoized JSON bytes
+        body = response_cache.get(vt)
+        if body is None:
+            original, prediction, cacheable = compute_prediction(vehicle_type_to_model[vt])
+            body = orjson.dumps(build_response(vt, original, prediction))
+            if cacheable:
+                response_cache[vt] = body
         
-        print("Prediction completed successfully")
+        logger.info("Prediction completed successfully")
         
-        return {
-            "status": "success",
-            "vehicle_type": vehicle_type,
-            "ev_model": ev_model,
-            "chart_url": chart_url,
-            "table_data": rows
-        }
+        # Returning the bytes directly skips jsonable_encoder and re-serialization
+        return Response(content=body, media_type="application/json")
         
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Prediction error: {e}")
+        logger.error("Prediction error: %s", e)
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
 @app.get("/vehicle-types")
 async def get_vehicle_types():
-    return {"vehicle_types": list(vehicle_type_to_model.keys())}
+    return {"vehicle_types": valid_vehicle_types}
 
 # Add a warmup endpoint
 @app.get("/warmup")
-async def warmup():
-    """Warmup endpoint to ensure models are loaded"""
-    global model, data, scaler
+def warmup():
+    """Warmup endpoint that runs a dummy forward pass"""
+    global interpreter, data, feature_scale
+    try:
+        warmed_up = warmup_interpreter()
+    except Exception as e:
+        logger.error("Warmup error: %s", e)
+        warmed_up = False
     return {
         "status": "ready",
-        "model_status": "loaded" if model is not None else "not_loaded",
+        "warmed_up": warmed_up,
+        "model_status": "loaded" if interpreter is not None or keras_model is not None else "not_loaded",
         "data_status": "loaded" if data is not None else "not_loaded",
-        "scaler_status": "loaded" if scaler is not None else "not_loaded"
+        "scaler_status": "loaded" if feature_scale is not None else "not_loaded"
     }
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, timeout_keep_alive=120)
+    # Each worker loads its own TensorFlow, model and dataset, so keep the default small;
+    # raise WEB_CONCURRENCY (e.g. towards 2 * cores + 1) on hosts with memory to spare.
+    # First-boot TFLite/parquet files are written atomically, so workers can start together.
+    workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 8000)),
+        workers=workers,
+        loop="auto",  # uvloop/httptools when installed via uvicorn[standard]
+        http="auto",
+        timeout_keep_alive=120
+    )
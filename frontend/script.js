@@ -29,6 +29,7 @@ let lastSuccessfulConnection = null;
 let connectionRetries = 0;
 let sessionStartTime = Date.now();
 let lastUserActivity = Date.now();
+let predictionChartInstance = null;
 
 // Smart timing calculation
 function calculateOptimalPingInterval() {
@@ -442,33 +443,57 @@ function displayResults(data) {
     resultsSection.style.display = 'block';
     resultsSection.scrollIntoView({ behavior: 'smooth' });
     
-    displayChart(data.chart_url);
+    displayChart(data.chart_series);
     displayTable(data.table_data);
     updateSummaryCards(data.table_data);
 }
 
-function displayChart(chartUrl) {
-    chartLoading.style.display = 'none';
-    
-    let fullChartUrl = chartUrl;
-    
-    if (chartUrl.startsWith('/') || !chartUrl.startsWith('http')) {
-        const cleanUrl = chartUrl.replace(/^\//, '');
-        fullChartUrl = `${API_BASE_URL}/${cleanUrl}`;
+function displayChart(chartSeries) {
+    if (predictionChartInstance) {
+        predictionChartInstance.destroy();
+        predictionChartInstance = null;
     }
     
-    predictionChart.src = fullChartUrl;
-    predictionChart.style.display = 'block';
-    
-    predictionChart.onerror = function() {
+    // Chart.js comes from a CDN; if it failed to load, keep the table usable
+    if (typeof Chart === 'undefined') {
         showError('Chart temporarily unavailable. Data table is still available below.');
+        predictionChart.style.display = 'none';
         chartLoading.style.display = 'flex';
         chartLoading.innerHTML = '<p>Chart unavailable</p>';
-    };
+        return;
+    }
+    
+    chartLoading.style.display = 'none';
+    predictionChart.style.display = 'block';
+    
+    predictionChartInstance = new Chart(predictionChart, {
+        type: 'bar',
+        data: {
+            labels: chartSeries.labels,
+            datasets: [
+                {
+                    label: 'Original',
+                    data: chartSeries.original,
+                    backgroundColor: 'rgba(46, 134, 171, 0.8)'
+                },
+                {
+                    label: 'Predicted',
+                    data: chartSeries.predicted,
+                    backgroundColor: 'rgba(162, 59, 114, 0.8)'
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            animation: false,
+            scales: {
+                x: { title: { display: true, text: 'Parameters' } },
+                y: { title: { display: true, text: 'Values' } }
+            }
+        }
+    });
     
-    predictionChart.onload = function() {
-        console.log('✅ Chart loaded successfully');
-    };
+    console.log('✅ Chart rendered successfully');
 }
 
 function displayTable(tableData) {
@@ -562,9 +587,9 @@ function closeErrorModal() {
 }
 
 function downloadChart() {
-    if (predictionChart.src) {
+    if (predictionChartInstance) {
         const link = document.createElement('a');
-        link.href = predictionChart.src;
+        link.href = predictionChartInstance.toBase64Image();
         link.download = `battery-prediction-chart-${new Date().getTime()}.png`;
         link.click();
     } else {